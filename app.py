@@ -10,16 +10,23 @@ from pathlib import Path
 
 import os
 import re
-import json
 import uuid
 import time
+import string
 import queue
 import signal
+import logging
+import selectors
 import threading
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
 
 from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
+import orjson
 import pyudev
 
 # ------------------------------------------------------------------------------
@@ -35,29 +42,74 @@ CERT_OUT_DIR  = Path("/var/log/tcs-wiper/certs")       # archive location for PD
 # Printer to use (None = default CUPS printer)
 DEFAULT_PRINTER = None   # e.g., "HP_LaserJet_Pro_M127fn" if you want to force a specific one
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify)."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Logging: records go through a queue so callers never block on stdout;
+# level from WIPE_LOG_LEVEL (DEBUG shows per-tick job progress)
+log = logging.getLogger("wipe")
+LOG_LEVEL = os.getenv("WIPE_LOG_LEVEL", "INFO").upper()
 
 # SAFETY: Never allow wiping protected disks
 PROTECTED_DISKS = {"sda"}  # expand as needed, e.g., {"sda","nvme0n1"}
 
+# Whole-disk names the wipe API accepts (sd[a-z])
+_VALID_DISK_NAMES = frozenset(f"sd{c}" for c in string.ascii_lowercase)
+
 # Ignore these "disks" (non-physical, virtual, or partitions only)
 IGNORE_PREFIXES = ("loop", "md", "dm-", "zram", "sr", "ram")
+_IGNORE_RE = re.compile("|".join(re.escape(p) for p in IGNORE_PREFIXES))  # C-level prefix match
 
-# Event dedup window for udev (seconds)
-DEDUP_WINDOW_SEC = 2.0
+# Debounce delay for udev events per disk (seconds); bursts publish once
+UDEV_DEBOUNCE_SEC = 0.1
 
 # In-memory state
 state_lock = threading.Lock()
 disks = {}       # key: "sdb", value: dict with details
-last_events = {} # name -> {"type": str, "ts": float}
+_disks_snapshot = ()  # tuple(disks.values()), swapped under state_lock; read lock-free
+pending_lock = threading.Lock()
+pending_events = {} # name -> (threading.Timer, latest action, latest device)
+udev_name_locks = {} # name -> Lock serializing that disk's event handling
+_udev_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="udev")
 
 # Wipe jobs
 job_lock = threading.Lock()
 jobs = {}        # job_id -> job dict
+_jobs_snapshot = ()   # tuple(jobs.values()), swapped under job_lock; read lock-free
 disk_running = {} # disk name -> job_id (to prevent concurrent wipes on same disk)
 
+# Pre-encoded /api/disks and /api/jobs bodies: [payload (b"" = stale), version].
+# Mutations bump the version; "<boot id>-<version>" is the response ETag, so a
+# tag from before a restart never matches (versions restart at 0).
+_BOOT_ID = uuid.uuid4().hex[:8]
+_cache_lock = threading.Lock()
+_disks_cache = [b"", 0]
+_jobs_cache = [b"", 0]
+
+# Audit log (JSONL, one file per month), written by audit_writer_thread
+AUDIT_LOG_DIR = Path("/var/log/tcs-wiper")
+AUDIT_FSYNC_INTERVAL_SEC = 5.0
+_audit_q = queue.Queue()  # finished job records waiting to be written
+
 # Global event broker for SSE
 events_broker = None
+SSE_CLIENT_QUEUE_MAX = 256  # per-client backlog before oldest events are dropped
+SSE_MAX_CONSECUTIVE_DROPS = 32  # then the client is disconnected
+SSE_BATCH_WINDOW_SEC = 0.05  # events published within this window go out as one "batch" frame
+DISK_EVENT_TYPES = ("snapshot", "add", "change", "remove")  # /events topics
+JOB_EVENT_TYPES = ("job", "jobs_tick", "jobs_snapshot")     # /events/jobs topics
+
+# Shared libudev context (created in start_background_services(), or lazily by udev_context())
+UDEV_CTX = None
 
 # ------------------------------------------------------------------------------
 # I/O error & stall handling
@@ -73,8 +125,37 @@ IO_ERROR_PATTERNS = [
     r"cannot allocate memory for \w+ buffer",  # occasionally shows on dying HW
 ]
 
+_IO_ERROR_RE = re.compile("|".join(f"(?:{p})" for p in IO_ERROR_PATTERNS), re.IGNORECASE)
+
+# Progress parsing of helper stderr ("<n> bytes ... copied")
+_BYTES_RE = re.compile(rb"(\d+)\s+bytes")
+_LINE_SPLIT_RE = re.compile(rb"[\r\n]")
+# Progress chatter (dd byte counts / record totals, shred's "... 42%" updates):
+# feeds the progress bar via jobs_tick, never the job log or a full job event
+_PROGRESS_LINE_RE = re.compile(rb"\d+\s+bytes|records (?:in|out)|\d+%\s*$")
+# shred -v: "pass 3/7 (random)...250GiB/500GiB 50%" (no byte counts)
+_SHRED_PASS_RE = re.compile(rb"pass (\d+)/(\d+)[^\r\n]*?(\d+)%")
+STDERR_CHUNK_SIZE = 65536
+
+# Shared stderr reader for all running wipes (see _io_loop)
+_io_sel = selectors.DefaultSelector()
+_io_lock = threading.Lock()
+_io_thread = None
+
+# Progress of all running jobs is published as one merged "jobs_tick" event
+# per interval (dd/shred can emit far faster); see progress_publisher_thread
+PROGRESS_TICK_SEC = 0.25
+# Fields carried by progress rows (full job is sent on status/log changes)
+JOB_PROGRESS_KEYS = ("id", "disk", "bytes", "percent", "mbps", "eta_sec")
+# Per-job log ring; events and /api/jobs carry only the newest line
+JOB_LOG_MAX = 200
+_progress_lock = threading.Lock()
+_progress_dirty = set()  # job ids with progress not yet published
+
 STALL_TIMEOUT_SEC = 150   # consider "stalled" if no progress for this many seconds
 KILL_GRACE_SEC    = 3     # grace between SIGTERM and SIGKILL for the job
+CANCEL_POLL_SEC   = 1.0   # how often a running stream checks for cancellation
+SYSFS_PROGRESS_POLL_SEC = 1.0  # progress polling for helpers without byte output
 
 def _kill_process_group(proc: subprocess.Popen, reason: str):
     try:
@@ -95,72 +176,157 @@ def _kill_process_group(proc: subprocess.Popen, reason: str):
 # Utilities
 # ------------------------------------------------------------------------------
 
-def run_cmd_json(cmd):
-    out = subprocess.check_output(cmd, text=True)
-    return json.loads(out)
+def setup_logging() -> QueueListener:
+    """
+    Attach a QueueHandler to the "wipe" logger and start a QueueListener that
+    does the actual (blocking) console writes on its own thread.
+    """
+    log_q = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_q, console)
+    log.addHandler(QueueHandler(log_q))
+    known = LOG_LEVEL in logging.getLevelNamesMapping()
+    log.setLevel(LOG_LEVEL if known else logging.INFO)
+    log.propagate = False
+    listener.start()
+    if not known:
+        log.warning("Unknown WIPE_LOG_LEVEL %r, using INFO", LOG_LEVEL)
+    return listener
+
+
+def _dumps(obj) -> str:
+    """JSON-encode with orjson (audit log)."""
+    return orjson.dumps(obj).decode()
+
 
+def sse_frame(event) -> bytes:
+    """Encode an event as an SSE 'data:' frame, staying in bytes end to end."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
 
-def enrich_serial_from_udev(name: str, current_serial: str) -> str:
+
+def json_response(payload) -> Response:
+    """JSON response straight from orjson bytes (no str round-trip)."""
+    return Response(orjson.dumps(payload), mimetype="application/json")
+
+
+def invalidate_cache(cache):
+    """Drop a cached body and bump its version (ETag)."""
+    with _cache_lock:
+        cache[0] = b""
+        cache[1] += 1
+
+
+def cached_json_response(cache, build) -> Response:
+    """
+    Serve a cached pre-encoded body, or 304 if the client's ETag is current.
+    build() is only called (and encoded once) after an invalidation.
+    """
+    with _cache_lock:
+        payload, version = cache
+    etag = f"{_BOOT_ID}-{version}"
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+    if not payload:
+        payload = orjson.dumps(build())
+        with _cache_lock:
+            if cache[1] == version:  # not invalidated while encoding
+                cache[0] = payload
+    resp = Response(payload, mimetype="application/json")
+    resp.set_etag(etag)
+    return resp
+
+
+def udev_context():
     """
-    Try to pull ID_SERIAL[_SHORT] from udev if lsblk serial is empty.
+    Return the shared pyudev.Context, creating it on first use.
     """
-    if current_serial:
-        return current_serial
+    global UDEV_CTX
+    if UDEV_CTX is None:
+        UDEV_CTX = pyudev.Context()
+    return UDEV_CTX
+
+
+def skip_disk(name: str) -> bool:
+    """
+    Single filter for scans and udev events: empty, protected, or a
+    non-physical device (loop, md, dm-, zram, sr, ram).
+    """
+    return not name or name in PROTECTED_DISKS or _IGNORE_RE.match(name) is not None
+
+
+def _read_sysfs(name: str, rel: str) -> str:
     try:
-        ctx = pyudev.Context()
-        dev = ctx.device_from_device_file(f"/dev/{name}")
-        for key in ("ID_SERIAL_SHORT", "ID_SERIAL"):
-            val = dev.properties.get(key, "").strip()
-            if val:
-                return val
+        with open(f"/sys/block/{name}/{rel}", "r") as f:
+            return f.read().strip()
     except Exception:
-        pass
-    return ""
+        return ""
+
+
+def _transport(dev) -> str:
+    """
+    Transport as lsblk's TRAN column reports it (sata/ata/usb/nvme/sas/...),
+    derived from the device's sysfs path and udev ID_PATH rather than
+    ID_BUS (which says 'ata'/'scsi' for SATA and USB alike).
+    """
+    props = dev.properties
+    id_path = props.get("ID_PATH") or ""
+    sys_path = dev.sys_path
+    if "/usb" in sys_path or "-usb-" in id_path:
+        return "usb"
+    if dev.sys_name.startswith("nvme") or "-nvme-" in id_path:
+        return "nvme"
+    if "/ata" in sys_path or "-ata-" in id_path:
+        return "sata" if props.get("ID_ATA_SATA") == "1" else "ata"
+    if "-sas-" in id_path:
+        return "sas"
+    return (props.get("ID_BUS") or "").strip()
+
+
+def _disk_info_from_device(dev):
+    """
+    Build the disk info dict straight from a pyudev Device (udev properties
+    plus sysfs), so no lsblk fork/exec is needed per disk or per event.
+    Returns None if the disk is already gone from sysfs (e.g. a late
+    'change' for a disk that was just pulled).
+    """
+    name = dev.sys_name
+    if not os.path.isdir(f"/sys/block/{name}"):
+        return None
+    props = dev.properties
+
+    return {
+        "name": name,
+        "path": f"/dev/{name}",
+        "size": device_size_bytes(name),  # bytes
+        "rotational": is_rotational(name),
+        "model": (props.get("ID_MODEL") or "").replace("_", " ").strip(),
+        "serial": (props.get("ID_SERIAL_SHORT") or props.get("ID_SERIAL") or "").strip(),
+        "vendor": (props.get("ID_VENDOR") or "").strip(),
+        "wwn": (props.get("ID_WWN") or "").strip(),
+        "tran": _transport(dev),                       # sata/usb/nvme/etc, as lsblk
+        "state": _read_sysfs(name, "device/state"),    # may be empty
+        "protected": name in PROTECTED_DISKS,
+    }
 
 
 def scan_disks():
     """
     Return a dict of current disks keyed by device name (e.g., 'sdb'),
-    using lsblk in bytes mode and enriching serial from udev.
+    enumerated from udev instead of shelling out to lsblk.
     """
     result = {}
     try:
-        data = run_cmd_json([
-            "lsblk", "-J", "-b",  # bytes for numeric size
-            "-o", "NAME,TYPE,SIZE,MODEL,SERIAL,VENDOR,WWN,TRAN,STATE"
-        ])
-        for blk in data.get("blockdevices", []):
-            if blk.get("type") != "disk":
-                continue
-            name = blk.get("name", "")
-            if not name or name in PROTECTED_DISKS:
+        for dev in udev_context().list_devices(subsystem="block", DEVTYPE="disk"):
+            if skip_disk(dev.sys_name):
                 continue
-            if name.startswith(IGNORE_PREFIXES):
-                continue
-
-            info = {
-                "name": name,
-                "path": f"/dev/{name}",
-                "size": blk.get("size") or 0,  # bytes (int or str convertible)
-                "model": (blk.get("model") or "").strip(),
-                "serial": (blk.get("serial") or "").strip(),
-                "vendor": (blk.get("vendor") or "").strip(),
-                "wwn": (blk.get("wwn") or "").strip(),
-                "tran": (blk.get("tran") or "").strip(),   # sata/usb/etc
-                "state": (blk.get("state") or "").strip(), # may be empty
-                "protected": name in PROTECTED_DISKS,
-            }
-            # ensure integer size
-            try:
-                info["size"] = int(info["size"])
-            except Exception:
-                info["size"] = 0
-
-            # Enrich serial from udev if empty
-            info["serial"] = enrich_serial_from_udev(name, info["serial"])
-            result[name] = info
+            info = _disk_info_from_device(dev)
+            if info is not None:
+                result[dev.sys_name] = info
     except Exception as e:
-        print(f"[scan_disks] Error: {e}")
+        log.error("[scan_disks] Error: %s", e)
     return result
 
 
@@ -173,98 +339,123 @@ def is_rotational(name: str) -> bool:
         return True
 
 
-def device_size_bytes(devpath: str) -> int:
+def device_size_bytes(name: str) -> int:
     """
-    Return device size in bytes with multiple fallbacks.
-    Order matters:
-      1) /sys (no privileges needed)
-      2) lsblk (no privileges, reads sysfs)
-      3) blockdev (may require group perms; stderr silenced to avoid console spam)
+    Device size in bytes from sysfs; /sys/block/<n>/size is always in
+    512-byte sectors, regardless of the disk's logical block size.
     """
-    import subprocess, os
-
-    # 1) sysfs: sectors * logical_block_size
     try:
-        name = os.path.basename(devpath)
-        with open(f"/sys/block/{name}/size", "r") as f:
-            sectors = int(f.read().strip())
-        lbs = 512
-        try:
-            with open(f"/sys/block/{name}/queue/logical_block_size", "r") as f:
-                lbs = int(f.read().strip())
-        except Exception:
-            pass
-        return sectors * lbs
+        return int(_read_sysfs(name, "size")) * 512
     except Exception:
-        pass
-
-    # 2) lsblk (reads sysfs; should work unprivileged)
-    try:
-        out = subprocess.check_output(
-            ["lsblk", "-nb", "-o", "SIZE", devpath],
-            text=True,
-            stderr=subprocess.DEVNULL,   # avoid noise if something’s odd
-        ).strip()
-        if out.isdigit():
-            return int(out)
-    except Exception:
-        pass
-
-    # 3) blockdev (may need perms; silence stderr so we don't spam console)
-    for bd in ("blockdev", "/sbin/blockdev", "/usr/sbin/blockdev"):
-        try:
-            out = subprocess.check_output(
-                [bd, "--getsize64", devpath],
-                text=True,
-                stderr=subprocess.DEVNULL,   # <-- important
-            ).strip()
-            if out.isdigit():
-                return int(out)
-        except Exception:
-            continue
+        return 0
 
-    return 0
 
 
-
-def should_publish(name: str, action: str) -> bool:
+class Mailbox:
     """
-    Deduplicate rapid identical udev events per disk.
+    Per-client SSE mailbox: a bounded deque of encoded frames (the oldest is
+    dropped on overflow) plus an Event to wake the reader. deque append/popleft
+    are atomic under the GIL, so no Condition/mutex is involved per event.
     """
-    now = time.time()
-    le = last_events.get(name)
-    if le and le["type"] == action and (now - le["ts"]) < DEDUP_WINDOW_SEC:
-        return False
-    last_events[name] = {"type": action, "ts": now}
-    return True
+    __slots__ = ("dq", "ev", "topics", "drops", "closed")
+
+    def __init__(self, topics=None):
+        self.dq = deque(maxlen=SSE_CLIENT_QUEUE_MAX)
+        self.ev = threading.Event()
+        self.topics = topics   # frozenset of event types, None = all
+        self.drops = 0         # consecutive overflow drops (slow-consumer detection)
+        self.closed = False
+
+    def put(self, frame):
+        if len(self.dq) == SSE_CLIENT_QUEUE_MAX:
+            self.drops += 1
+        else:
+            self.drops = 0
+        self.dq.append(frame)
+        self.ev.set()
+
+    def close(self):
+        self.closed = True
+        self.ev.set()
+
+    def frames(self):
+        """Yield frames as they arrive until the mailbox is closed."""
+        while not self.closed:
+            self.ev.wait()
+            self.ev.clear()
+            while self.dq and not self.closed:
+                yield self.dq.popleft()
 
 
 class EventBroker:
     """
-    SSE broadcaster. Each client gets its own Queue.
+    SSE broadcaster. Each client gets its own Mailbox of already-encoded
+    "data: ..." SSE frames (bytes), filtered by the event types (topics) it
+    subscribed to. The client list is an immutable tuple swapped on
+    register/unregister (copy-on-write), so publish() can iterate it without
+    taking the lock.
+
+    publish() only enqueues; a flusher thread drains everything published
+    within SSE_BATCH_WINDOW_SEC and hands each client a single frame, so a
+    hot-plug burst costs one wakeup and one write per client.
     """
     def __init__(self):
-        self.clients = []
+        self.clients = ()
         self.lock = threading.Lock()
+        self.pending = queue.SimpleQueue()
+        threading.Thread(target=self._flush_loop, name="sse-batch", daemon=True).start()
 
-    def register(self):
-        q = queue.Queue()
+    def register(self, topics=None):
+        mb = Mailbox(frozenset(topics) if topics is not None else None)
         with self.lock:
-            self.clients.append(q)
-        return q
+            self.clients = self.clients + (mb,)
+        return mb
 
-    def unregister(self, q):
+    def unregister(self, mb):
         with self.lock:
-            if q in self.clients:
-                self.clients.remove(q)
+            self.clients = tuple(c for c in self.clients if c is not mb)
 
-    def publish(self, event):   # <-- needs self, event
-        with self.lock:
-            for q in list(self.clients):
-                try:
-                    q.put_nowait(event)
-                except queue.Full:
-                    pass
+    def publish(self, event):
+        self.pending.put(event)
+
+    def _flush_loop(self):
+        while True:
+            events = [self.pending.get()]  # block until something happens
+            time.sleep(SSE_BATCH_WINDOW_SEC)
+            try:
+                while True:
+                    events.append(self.pending.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self._deliver(events)
+            except Exception as e:
+                log.error("[sse] delivery failed: %s", e)
+
+    def _deliver(self, events):
+        clients = self.clients  # atomic snapshot; no lock on the hot path
+        frames = {}  # topics -> encoded frame, shared by clients with equal filters
+        for mb in clients:
+            frame = frames.get(mb.topics)
+            if frame is None:
+                if mb.topics is None:
+                    mine = events
+                else:
+                    mine = [e for e in events if e.get("type") in mb.topics]
+                if not mine:
+                    continue
+                # Serialize once per filter; a lone event goes out unwrapped
+                if len(mine) == 1:
+                    frame = sse_frame(mine[0])
+                else:
+                    frame = sse_frame({"type": "batch", "events": mine})
+                frames[mb.topics] = frame
+            mb.put(frame)  # drops the oldest frame if the client is behind
+            if mb.drops > SSE_MAX_CONSECUTIVE_DROPS:
+                # persistently slow client: cut it off instead of feeding it;
+                # the browser's EventSource reconnects and gets a fresh snapshot
+                self.unregister(mb)
+                mb.close()
 
 
 
@@ -272,67 +463,113 @@ class EventBroker:
 # Hot-plug monitoring (udev)
 # ------------------------------------------------------------------------------
 
-def udev_monitor_thread():
+def _refresh_disks_snapshot():
+    """Rebuild the lock-free disks snapshot. Caller must hold state_lock."""
+    global _disks_snapshot
+    _disks_snapshot = tuple(disks.values())
+    invalidate_cache(_disks_cache)
+
+
+def _apply_udev_event(name: str, action: str, device):
     """
-    Watch block device add/remove/change, update state, and publish de-duped events.
+    Update state for one disk from its latest udev event and publish once.
     """
-    context = pyudev.Context()
-    monitor = pyudev.Monitor.from_netlink(context)
-    monitor.filter_by("block")
-
-    for device in iter(monitor.poll, None):
+    if action in ("add", "change"):
+        # one sysfs/udev read, outside the lock; the lock covers the dict update only
+        info = _disk_info_from_device(device)
+        if info is None:
+            return  # vanished before we got to it; its 'remove' follows
+        with state_lock:
+            kind = "change" if name in disks else "add"
+            disks[name] = info
+            _refresh_disks_snapshot()
+        events_broker.publish({"type": kind, "disk": info, "ts": time.time()})
+
+    elif action == "remove":
+        with state_lock:
+            removed = disks.pop(name, None)
+            if removed is not None:
+                _refresh_disks_snapshot()
+        if removed is not None:
+            events_broker.publish({"type": "remove", "disk": removed, "ts": time.time()})
+
+
+def _flush_udev_event(name: str):
+    # serialize per disk so a slow flush can't be overtaken by a newer one
+    with pending_lock:
+        name_lock = udev_name_locks.setdefault(name, threading.Lock())
+    with name_lock:
+        with pending_lock:
+            entry = pending_events.pop(name, None)
+        if entry is None:
+            return  # already flushed by an earlier timer
+        _, action, device = entry
         try:
-            action = device.action        # 'add', 'remove', 'change'
-            devtype = device.get("DEVTYPE")  # 'disk', 'partition'
-            name = device.sys_name        # e.g., 'sdb'
+            _apply_udev_event(name, action, device)
+        except Exception as e:
+            log.error("[udev] Error: %s", e)
 
-            # Only whole disks
-            if devtype != "disk":
-                continue
-            # Never consider protected/non-physical
-            if name in PROTECTED_DISKS or name.startswith(IGNORE_PREFIXES):
-                continue
 
-            # debounce
-            if not should_publish(name, action):
-                continue
+def _schedule_udev_event(name: str, action: str, device):
+    """
+    Debounce: (re)arm a per-disk timer so a burst of events on one disk
+    publishes once, UDEV_DEBOUNCE_SEC after the last event, with its latest state.
+    """
+    with pending_lock:
+        prev = pending_events.get(name)
+        if prev:
+            prev[0].cancel()
+        # the timer only hands off; handling runs on the shared udev pool
+        t = threading.Timer(UDEV_DEBOUNCE_SEC, _udev_pool.submit, args=(_flush_udev_event, name))
+        t.daemon = True
+        pending_events[name] = (t, action, device)
+        t.start()
+
+
+def _on_udev_event(device):
+    """
+    MonitorObserver callback: filter and hand the event to the debouncer.
+    Never does slow work, so the netlink socket is drained promptly.
+    """
+    try:
+        action = device.action        # 'add', 'remove', 'change'
+        devtype = device.get("DEVTYPE")  # 'disk', 'partition'
+        name = device.sys_name        # e.g., 'sdb'
 
-            if action == "add":
-                snapshot = scan_disks()
-                with state_lock:
-                    if name not in disks and name in snapshot:
-                        disks[name] = snapshot[name]
-                        events_broker.publish({"type": "add", "disk": disks[name], "ts": time.time()})
-
-            elif action == "change":
-                snapshot = scan_disks()
-                with state_lock:
-                    if name in snapshot:
-                        first_time = name not in disks
-                        disks[name] = snapshot[name]
-                        events_broker.publish({
-                            "type": "add" if first_time else "change",
-                            "disk": disks[name],
-                            "ts": time.time()
-                        })
-
-            elif action == "remove":
-                with state_lock:
-                    if name in disks:
-                        removed = disks.pop(name)
-                        events_broker.publish({"type": "remove", "disk": removed, "ts": time.time()})
-                last_events.pop(name, None)
+        # Only whole disks
+        if devtype != "disk":
+            return
+        # Never consider protected/non-physical
+        if skip_disk(name):
+            return
 
-        except Exception as e:
-            print(f"[udev_monitor_thread] Error: {e}")
+        _schedule_udev_event(name, action, device)
+
+    except Exception as e:
+        log.error("[udev] Error: %s", e)
+
+
+def start_udev_monitor() -> pyudev.MonitorObserver:
+    """
+    Watch block device add/remove/change on pyudev's observer thread; state
+    updates and publishes are debounced and run on _udev_pool.
+    """
+    monitor = pyudev.Monitor.from_netlink(udev_context())
+    monitor.filter_by("block")
+    observer = pyudev.MonitorObserver(monitor, callback=_on_udev_event, name="udev-monitor")
+    observer.daemon = True
+    observer.start()
+    return observer
 
 
 # ------------------------------------------------------------------------------
 # Flask routes - pages & APIs
 # ------------------------------------------------------------------------------
 
-@app.route("/")
-def index():
+_INDEX_HTML = None  # rendered once; the page only depends on PROTECTED_DISKS
+
+
+def _render_index() -> str:
     # If you have a Jinja template (templates/index.html), render it;
     # otherwise send a minimal HTML so the service stays functional.
     try:
@@ -341,37 +578,39 @@ def index():
         return (
             "<!doctype html><title>Wipe Station</title>"
             "<h1>Wipe Station API</h1>"
-            "<p>Use /api/disks, /api/wipe/&lt;sdX&gt;?level=low|med|high, /events, /events/jobs</p>",
-            200,
-            {"Content-Type": "text/html"},
+            "<p>Use /api/disks, /api/wipe/&lt;sdX&gt;?level=low|med|high, /events, /events/jobs</p>"
         )
 
 
+@app.route("/")
+def index():
+    global _INDEX_HTML
+    if _INDEX_HTML is None:
+        _INDEX_HTML = _render_index()
+    return _INDEX_HTML
+
+
 @app.route("/api/disks")
 def api_disks():
-    with state_lock:
-        current = list(disks.values())
-    return jsonify({"disks": current, "protected": list(PROTECTED_DISKS)})
+    return cached_json_response(
+        _disks_cache,
+        lambda: {"disks": list(_disks_snapshot), "protected": list(PROTECTED_DISKS)},
+    )
 
 
 @app.route("/events")
 def sse_disks():
     def stream():
-        q = events_broker.register()
+        mb = events_broker.register(DISK_EVENT_TYPES)
         try:
             # initial snapshot
-            with state_lock:
-                snapshot = list(disks.values())
-            yield f"data: {json.dumps({'type':'snapshot','disks':snapshot,'ts':time.time()})}\n\n"
-            while True:
-                event = q.get()
-                # forward disk events only
-                if event.get("type") in ("snapshot", "add", "change", "remove"):
-                    yield f"data: {json.dumps(event)}\n\n"
+            snapshot = list(_disks_snapshot)
+            yield sse_frame({"type": "snapshot", "disks": snapshot, "ts": time.time()})
+            yield from mb.frames()
         except GeneratorExit:
             pass
         finally:
-            events_broker.unregister(q)
+            events_broker.unregister(mb)
     return Response(stream(), mimetype="text/event-stream")
 
 
@@ -379,78 +618,243 @@ def sse_disks():
 # Wipe job engine
 # ------------------------------------------------------------------------------
 
-def stream_cmd(cmd, progress_cb, line_cb=None):
+def _sectors_written(name: str) -> int:
+    """Sectors written so far (512-byte units), field 7 of /sys/block/<n>/stat."""
+    fields = _read_sysfs(name, "stat").split()
+    try:
+        return int(fields[6])
+    except (IndexError, ValueError):
+        return 0
+
+
+def stream_cmd_sysfs_progress(cmd, name, progress_cb, line_cb=None, cancel=None):
+    """
+    stream_cmd for helpers that print no byte counts (e.g. BLKZEROOUT):
+    progress comes from polling the disk's write counters in sysfs instead.
+    """
+    base = _sectors_written(name)
+    finished = threading.Event()
+
+    def poll():
+        while not finished.wait(SYSFS_PROGRESS_POLL_SEC):
+            progress_cb(max(0, _sectors_written(name) - base) * 512)
+
+    t = threading.Thread(target=poll, daemon=True)
+    t.start()
+    try:
+        return stream_cmd(cmd, progress_cb, line_cb, cancel=cancel)
+    finally:
+        finished.set()
+        t.join()
+
+
+def _last_byte_count(buf: bytes):
+    """
+    Return the newest '<n> bytes' count in buf, or None.
+    Fast path: dd's fixed "<digits> bytes" format via rfind + a reverse digit
+    scan; falls back to the regex for anything else (e.g. odd whitespace).
+    """
+    i = buf.rfind(b" bytes")
+    j = i
+    while j > 0 and 48 <= buf[j - 1] <= 57:  # b"0".."9"
+        j -= 1
+    if 0 <= j < i:
+        return int(buf[j:i])
+
+    m = None
+    for m in _BYTES_RE.finditer(buf):
+        pass
+    return int(m.group(1)) if m else None
+
+
+def _last_shred_progress(buf: bytes, size: int):
+    """
+    Bytes-equivalent progress from the newest shred "pass k/n ... P%" line in
+    buf, i.e. ((k-1) + P/100) / n of the whole multi-pass job, or None.
+    """
+    m = None
+    for m in _SHRED_PASS_RE.finditer(buf):
+        pass
+    if m is None:
+        return None
+    k, n, pct = (int(g) for g in m.groups())
+    if n <= 0:
+        return None
+    return int(((k - 1) + min(pct, 100) / 100) / n * size)
+
+
+def _io_loop():
+    """
+    Shared stderr reader: one epoll-backed selector services the pipes of all
+    running wipes and dispatches readiness to each stream's callback.
+    """
+    while True:
+        try:
+            events = _io_sel.select(timeout=1.0)
+        except Exception as e:
+            log.error("[_io_loop] select failed: %s", e)
+            time.sleep(1.0)
+            continue
+        for key, _ in events:
+            try:
+                key.data(key.fileobj)
+            except Exception as e:
+                log.error("[_io_loop] callback failed: %s", e)
+
+
+def _io_register(fileobj, callback):
+    """Watch fileobj for reads on the shared I/O thread (started on first use)."""
+    global _io_thread
+    with _io_lock:
+        if _io_thread is None:
+            _io_thread = threading.Thread(target=_io_loop, daemon=True)
+            _io_thread.start()
+    _io_sel.register(fileobj, selectors.EVENT_READ, callback)
+
+
+def _io_unregister(fileobj):
+    try:
+        _io_sel.unregister(fileobj)
+    except (KeyError, ValueError):
+        pass
+
+
+class WipeCancelled(Exception):
+    """Raised by stream_cmd when the caller's cancel check fires."""
+
+
+def stream_cmd(cmd, progress_cb, line_cb=None, cancel=None, size=0):
     """
-    Run a command and stream stderr lines; parse '<n> bytes' to update progress.
+    Run a command and stream stderr lines; parse '<n> bytes' to update progress
+    (or, given the device size, shred's per-pass percentages).
     Detects I/O errors and long stalls. Returns (returncode, reason) where
     reason is one of: None, 'io_error', 'stalled'.
+    If cancel (a callable) returns True, the process group is killed and
+    WipeCancelled is raised once it has been reaped.
+
+    stderr is read in raw chunks by the shared I/O thread (callbacks run
+    there); only the newest byte count in each chunk is reported, since older
+    ones are already stale. The calling thread just waits for the stream to
+    finish and handles kill/reap.
     """
-    reason = None
-    last_bytes = -1
-    last_change = time.time()
+    st = {"reason": None, "last_bytes": -1, "last_change": time.monotonic(), "pending": b""}
+    finished = threading.Event()
+    stop_lock = threading.Lock()
 
     proc = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1,
-        preexec_fn=os.setsid,  # own process group for clean kill
+        start_new_session=True,  # own process group (setsid) for clean kill
     )
 
-    io_err_regexes = [re.compile(pat, re.IGNORECASE) for pat in IO_ERROR_PATTERNS]
-
-    # Read stderr line-by-line
-    for line in proc.stderr:
-        now = time.time()
-        s = line.rstrip("\n")
-
-        if line_cb:
-            line_cb(s)
+    def stop(reason=None):
+        with stop_lock:
+            if finished.is_set():
+                return  # first reason wins (e.g. cancel vs. a late EOF)
+            st["reason"] = reason
+            _io_unregister(proc.stderr)
+            finished.set()
 
-        # I/O error detection
-        if any(rx.search(s) for rx in io_err_regexes):
-            reason = "io_error"
-            # Make it visible in the job log as well
-            if line_cb:
-                line_cb("I/O error detected; aborting wipe and marking disk as FAILED")
-            _kill_process_group(proc, reason="io_error")
-            break
-
-        # Progress parsing
-        m = re.search(r"(\d+)\s+bytes", s)
-        if m:
+    def handle(fileobj):
+        try:
+            chunk = os.read(fileobj.fileno(), STDERR_CHUNK_SIZE)
+        except OSError:
+            chunk = b""
+        eof = not chunk
+        now = time.monotonic()
+
+        # dd's status=progress rewrites its line with '\r', so split on both
+        data = st["pending"] + chunk
+        if eof:
+            complete, st["pending"] = data, b""
+        else:
+            cut = max(data.rfind(b"\n"), data.rfind(b"\r"))
+            if cut < 0:
+                st["pending"] = data
+                return
+            complete, st["pending"] = data[:cut + 1], data[cut + 1:]
+
+        for raw in _LINE_SPLIT_RE.split(complete):
+            if not raw:
+                continue
+            s = raw.decode("utf-8", errors="replace")
+
+            if line_cb and not _PROGRESS_LINE_RE.search(raw):
+                line_cb(s)
+
+            # I/O error detection
+            if _IO_ERROR_RE.search(s):
+                # Make it visible in the job log as well
+                if line_cb:
+                    line_cb("I/O error detected; aborting wipe and marking disk as FAILED")
+                stop("io_error")
+                return
+
+        # Progress parsing (newest count in this chunk wins)
+        done = _last_byte_count(complete)
+        if done is None and size:
+            done = _last_shred_progress(complete, size)
+        if done is not None:
             try:
-                done = int(m.group(1))
                 progress_cb(done)
-                if done != last_bytes:
-                    last_bytes = done
-                    last_change = now
+                if done != st["last_bytes"]:
+                    st["last_bytes"] = done
+                    st["last_change"] = now
             except Exception:
                 pass
 
         # Stall detection (no progress and still running)
-        if (now - last_change) > STALL_TIMEOUT_SEC:
-            reason = "stalled"
+        if (now - st["last_change"]) > STALL_TIMEOUT_SEC:
             if line_cb:
                 line_cb(f"No progress for {STALL_TIMEOUT_SEC}s; aborting and marking as FAILED")
-            _kill_process_group(proc, reason="stalled")
-            break
+            stop("stalled")
+            return
+
+        if eof:
+            stop()
 
-    # If we exited the loop naturally, wait for process
+    def on_readable(fileobj):
+        try:
+            handle(fileobj)
+        except Exception as e:
+            # never leave the caller waiting on a stream we can't read
+            log.error("[stream_cmd] stderr handling failed: %s", e)
+            stop()
+
+    _io_register(proc.stderr, on_readable)
+    while not finished.wait(timeout=CANCEL_POLL_SEC):
+        if cancel is not None and cancel():
+            stop("cancelled")
+
+    reason = st["reason"]
+    if reason:
+        _kill_process_group(proc, reason=reason)
+
+    # If the stream ended naturally, wait for process
     try:
         rc = proc.wait(timeout=KILL_GRACE_SEC)
     except Exception:
         rc = proc.returncode if proc.returncode is not None else 1
+    proc.stderr.close()
 
+    if reason == "cancelled":
+        raise WipeCancelled()
     return rc, reason
 
 
 
+def job_view(job) -> dict:
+    """Public view of a job: everything but the log ring, plus its newest line."""
+    view = {k: v for k, v in job.items() if k != "log"}
+    view["last_log"] = job["log"][-1] if job["log"] else ""
+    return view
+
+
 @app.route("/api/wipe/<name>", methods=["POST"])
 def api_wipe(name):
     # Validate device name strictly: sd[a-z]
-    if not re.fullmatch(r"sd[a-z]", name):
+    if name not in _VALID_DISK_NAMES:
         return jsonify({"error": "invalid device name"}), 400
     if name in PROTECTED_DISKS:
         return jsonify({"error": "protected disk"}), 400
@@ -464,38 +868,61 @@ def api_wipe(name):
         if name in disk_running:
             jid = disk_running[name]
             job = jobs.get(jid)
-            return jsonify({"error": f"disk {name} already has running job {jid}", "job": job}), 400
+            return jsonify({"error": f"disk {name} already has running job {jid}",
+                            "job": job_view(job) if job else None}), 400
 
     try:
         job = start_wipe_job(name, level)
-        return jsonify({"job": job})
+        return jsonify({"job": job_view(job)})
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
 @app.route("/api/jobs")
 def api_jobs():
+    return cached_json_response(_jobs_cache, lambda: {"jobs": [job_view(j) for j in _jobs_snapshot]})
+
+
+@app.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def api_cancel_job(job_id):
+    with job_lock:
+        job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    with job_lock:
+        if job["status"] != "running":
+            return jsonify({"error": f"job is not running ({job['status']})"}), 400
+        if not job["cancellable"]:
+            return jsonify({"error": "current step cannot be cancelled"}), 409
+        # picked up by stream_cmd within CANCEL_POLL_SEC, or by the worker
+        # before it finalizes
+        job["cancel"] = True
+    invalidate_cache(_jobs_cache)
+    return jsonify({"job": job_view(job)})
+
+
+@app.route("/api/jobs/<job_id>/log")
+def api_job_log(job_id):
     with job_lock:
-        return jsonify({"jobs": list(jobs.values())})
+        job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return json_response({"id": job_id, "log": list(job["log"])})
 
 
 @app.route("/events/jobs")
 def sse_jobs():
     def stream():
-        q = events_broker.register()
+        mb = events_broker.register(JOB_EVENT_TYPES)
         try:
             # initial snapshot
-            with job_lock:
-                snapshot = list(jobs.values())
-            yield f"data: {json.dumps({'type':'jobs_snapshot','jobs':snapshot,'ts':time.time()})}\n\n"
-            while True:
-                evt = q.get()
-                if evt.get("type") in ("job",):
-                    yield f"data: {json.dumps(evt)}\n\n"
+            snapshot = [job_view(j) for j in _jobs_snapshot]
+            yield sse_frame({"type": "jobs_snapshot", "jobs": snapshot, "ts": time.time()})
+            yield from mb.frames()
         except GeneratorExit:
             pass
         finally:
-            events_broker.unregister(q)
+            events_broker.unregister(mb)
     return Response(stream(), mimetype="text/event-stream")
 
 def human_size_gb(nbytes: int) -> str:
@@ -564,26 +991,32 @@ def generate_and_print_certificate(job: dict, printer: str | None = DEFAULT_PRIN
         return True
 
     except Exception as e:
-        print(f"[JOB {job.get('disk')}] certificate generation failed: {e}", flush=True)
+        log.error("[JOB %s] certificate generation failed: %s", job.get("disk"), e)
         job["certificate_error"] = str(e)
         return False
 
 def start_wipe_job(name: str, level: str):
+    global _jobs_snapshot
     if name in PROTECTED_DISKS:
         raise RuntimeError("Refusing to wipe a protected disk")
 
     dev = f"/dev/{name}"
-    rot = is_rotational(name)
-    size = device_size_bytes(dev)  # in bytes
 
-    # Snapshot model/serial at job start (helps in UI modals and logs)
+    # Snapshot disk info at job start (helps in UI modals and logs); media
+    # type and size come from the same udev/sysfs scan, read sysfs only if
+    # the disk hasn't been seen yet
     with state_lock:
         disk_meta = disks.get(name, {})
+    rot = disk_meta.get("rotational")
+    if rot is None:
+        rot = is_rotational(name)
+    size = disk_meta.get("size") or device_size_bytes(name)  # in bytes
     model = disk_meta.get("model") or ""
     serial = disk_meta.get("serial") or ""
     tran = disk_meta.get("tran") or ""
 
     job_id = uuid.uuid4().hex
+    started_mono = time.monotonic()  # interval math only; job["started"] is wall clock
     job = {
         "id": job_id,
         "disk": name,
@@ -595,7 +1028,9 @@ def start_wipe_job(name: str, level: str):
         "bytes": 0,
         "percent": 0.0,
         "status": "running",
-        "log": [],
+        "cancel": False,  # set via /api/jobs/<id>/cancel
+        "cancellable": True,  # False while a step that must not be killed runs
+        "log": deque(maxlen=JOB_LOG_MAX),
         "pid": None,
         "method": None,
         # helpful for UI
@@ -609,21 +1044,25 @@ def start_wipe_job(name: str, level: str):
 
     # ---- helpers to notify UI & console ----
     def publish():
-        job_view = dict(job)
-        job_view["last_log"] = job["log"][-1] if job["log"] else ""
-        events_broker.publish({"type": "job", "job": job_view, "ts": time.time()})
+        # job view (newest log line only): job start, log lines and status transitions
+        invalidate_cache(_jobs_cache)
+        events_broker.publish({"type": "job", "job": job_view(job), "ts": time.time()})
 
     def logline(msg: str):
-        print(f"[JOB {name}] {msg}", flush=True)
+        log.info("[JOB %s] %s", name, msg)
         job["log"].append(msg)
         publish()
 
+    def cancelled() -> bool:
+        return job["cancel"]
+
     def set_progress(done_bytes: int):
         job["bytes"] = done_bytes
         if job["size"] > 0:
             job["percent"] = max(0.0, min(100.0, (done_bytes / job["size"]) * 100))
         # speed + eta
-        elapsed = max(1e-6, time.time() - job["started"])
+        now = time.monotonic()
+        elapsed = max(1e-6, now - started_mono)
         job["mbps"] = (job["bytes"] / elapsed) / (1024 * 1024)
         if job["size"] > 0 and job["bytes"] > 0:
             remaining = max(0, job["size"] - job["bytes"])
@@ -633,8 +1072,10 @@ def start_wipe_job(name: str, level: str):
         else:
             job["eta_sec"] = None
         # console debug
-        print(f"[JOB {name}] progress {job['percent']:.1f}% ({job['bytes']}/{job['size']} bytes)", flush=True)
-        publish()
+        log.debug("[JOB %s] progress %.1f%% (%d/%d bytes)", name, job["percent"], job["bytes"], job["size"])
+        # picked up by the next merged jobs_tick
+        with _progress_lock:
+            _progress_dirty.add(job_id)
 
     # ---- the worker thread that runs the wipe ----
     def worker():
@@ -643,14 +1084,22 @@ def start_wipe_job(name: str, level: str):
             if rot:
                 # ---------------- HDD ----------------
                 if level == "low":
-                    job["method"] = "dd zero (1 pass) via wipectl"
-                    cmd = ["sudo", "-n", "/usr/local/bin/wipectl", "hdd-zero", dev]
-                    rc, reason = stream_cmd(cmd, set_progress, logline)
-
-                    # dd may exit non-zero at end-of-device; treat as success if >= 99.9%
-                    if rc != 0 and job["bytes"] and job["size"] and job["bytes"] >= job["size"] * 0.999:
-                        logline("dd ended with ENOSPC at end-of-device; treating as success")
-                        rc, reason = (0, None)
+                    # kernel-side zeroing (BLKZEROOUT / Write Zeroes), no userspace copy
+                    job["method"] = "zero-out (1 pass, BLKZEROOUT) via wipectl"
+                    logline("Zeroing with BLKZEROOUT (progress from disk write counters)")
+                    cmd = ["sudo", "-n", "/usr/local/bin/wipectl", "hdd-zeroout", dev]
+                    rc, reason = stream_cmd_sysfs_progress(cmd, name, set_progress, logline, cancel=cancelled)
+
+                    if rc != 0 and reason is None:
+                        logline("BLKZEROOUT unavailable or failed; falling back to dd zero fill")
+                        job["method"] = "dd zero (1 pass) via wipectl"
+                        cmd = ["sudo", "-n", "/usr/local/bin/wipectl", "hdd-zero", dev]
+                        rc, reason = stream_cmd(cmd, set_progress, logline, cancel=cancelled)
+
+                        # dd may exit non-zero at end-of-device; treat as success if >= 99.9%
+                        if rc != 0 and job["bytes"] and job["size"] and job["bytes"] >= job["size"] * 0.999:
+                            logline("dd ended with ENOSPC at end-of-device; treating as success")
+                            rc, reason = (0, None)
 
                     # explicit failure reasons (surface to UI and stop)
                     if reason == "io_error":
@@ -669,7 +1118,7 @@ def start_wipe_job(name: str, level: str):
 
                     # ---- zero pass ----
                     rc, reason = stream_cmd(["sudo", "-n", "/usr/local/bin/wipectl", "hdd-zero", dev],
-                                            set_progress, logline)
+                                            set_progress, logline, cancel=cancelled)
                     if rc != 0 and job["bytes"] and job["size"] and job["bytes"] >= job["size"] * 0.999:
                         logline("dd ended with ENOSPC at end-of-device; treating zero pass as success")
                         rc, reason = (0, None)
@@ -690,7 +1139,7 @@ def start_wipe_job(name: str, level: str):
 
                     # ---- random pass ----
                     rc, reason = stream_cmd(["sudo", "-n", "/usr/local/bin/wipectl", "hdd-random", dev],
-                                            set_progress, logline)
+                                            set_progress, logline, cancel=cancelled)
 
                     if reason == "io_error":
                         job["status"] = "error: io_error"
@@ -706,7 +1155,7 @@ def start_wipe_job(name: str, level: str):
                 else:
                     job["method"] = "DoD 7-pass via wipectl (shred)"
                     cmd = ["sudo", "-n", "/usr/local/bin/wipectl", "hdd-dod", dev]
-                    rc, reason = stream_cmd(cmd, set_progress, logline)
+                    rc, reason = stream_cmd(cmd, set_progress, logline, cancel=cancelled, size=size)
 
                     if reason == "io_error":
                         job["status"] = "error: io_error"
@@ -723,31 +1172,56 @@ def start_wipe_job(name: str, level: str):
                 if level == "low":
                     job["method"] = "blkdiscard via wipectl"
                     logline("Running blkdiscard (no incremental progress)")
-                    rc = subprocess.call(["sudo", "-n", "/usr/local/bin/wipectl", "ssd-discard", dev])
+                    rc, reason = stream_cmd(["sudo", "-n", "/usr/local/bin/wipectl", "ssd-discard", dev],
+                                            set_progress, logline, cancel=cancelled)
                     if rc == 0:
                         set_progress(size)
 
                 elif level == "med":
                     job["method"] = "blkdiscard + dd zero via wipectl"
                     # helper does discard then dd zero; dd progress parsed
-                    rc = stream_cmd(["sudo", "-n", "/usr/local/bin/wipectl", "ssd-discard-zero", dev], set_progress, logline)
+                    rc, reason = stream_cmd(["sudo", "-n", "/usr/local/bin/wipectl", "ssd-discard-zero", dev],
+                                            set_progress, logline, cancel=cancelled)
                     if rc != 0 and job["bytes"] and job["size"] and job["bytes"] >= job["size"] * 0.999:
                         logline("dd ended with ENOSPC at end-of-device; treating as success")
-                        rc = 0
+                        rc, reason = (0, None)
+
+                    if reason == "io_error":
+                        job["status"] = "error: io_error"
+                        logline("I/O error during discard + zero; marking disk as FAILED")
+                        publish()
+                        return
+                    if reason == "stalled":
+                        job["status"] = "error: stalled"
+                        logline("Discard + zero stalled; marking disk as FAILED")
+                        publish()
+                        return
 
                 else:
                     job["method"] = "secure erase via wipectl (fallback blkdiscard)"
                     logline("Attempting ATA Secure Erase; will fall back if unsupported/frozen.")
+                    # killing hdparm mid-erase can leave the drive locked, so
+                    # this step refuses cancellation (checked in api_cancel_job)
+                    with job_lock:
+                        if job["cancel"]:
+                            raise WipeCancelled()
+                        job["cancellable"] = False
+                    publish()
                     rc = subprocess.call(["sudo", "-n", "/usr/local/bin/wipectl", "ssd-secure-erase", dev])
                     if rc == 0:
                         set_progress(size)
 
             # finalize status
             if rc == 0:
-                job["status"] = "done"
+                # a cancel that landed after the last step still wins; under
+                # job_lock so api_cancel_job can't accept one after "done"
+                with job_lock:
+                    if job["cancel"]:
+                        raise WipeCancelled()
+                    job["cancellable"] = False
+                    job["status"] = "done"
 
                 if rc == 0:
-                    job["status"] = "done"
                     if job["size"] and job["bytes"] < job["size"]:
                         set_progress(job["size"])
 
@@ -767,20 +1241,19 @@ def start_wipe_job(name: str, level: str):
                 job["status"] = "error"
                 publish()
 
+        except WipeCancelled:
+            job["status"] = "error: cancelled"
+            logline("Wipe cancelled by operator; disk is NOT sanitized")
+            publish()
         except Exception as ex:
             job["status"] = f"error: {ex}"
             publish()
         finally:
-            # persist log line for audit (JSONL monthly file)
-            try:
-                logdir = Path("/var/log/tcs-wiper")
-                logdir.mkdir(parents=True, exist_ok=True)
-                job_copy = dict(job)
-                job_copy["finished"] = time.time()
-                with open(logdir / f"jobs-{time.strftime('%Y-%m')}.log", "a") as f:
-                    f.write(json.dumps(job_copy) + "\n")
-            except Exception as e:
-                print(f"[JOB {name}] failed to write audit log: {e}", flush=True)
+            # persist log line for audit (JSONL monthly file, background writer)
+            job_copy = dict(job)
+            job_copy["log"] = list(job["log"])
+            job_copy["finished"] = time.time()
+            _audit_q.put(job_copy)
             # mark disk as free
             with job_lock:
                 if disk_running.get(name) == job_id:
@@ -791,7 +1264,9 @@ def start_wipe_job(name: str, level: str):
         if name in disk_running:
             raise RuntimeError(f"disk {name} already has a running job")
         jobs[job_id] = job
+        _jobs_snapshot = tuple(jobs.values())
         disk_running[name] = job_id
+    invalidate_cache(_jobs_cache)
 
     th = threading.Thread(target=worker, daemon=True)
     th.start()
@@ -799,33 +1274,139 @@ def start_wipe_job(name: str, level: str):
     return job
 
 
+def progress_publisher_thread():
+    """
+    Every PROGRESS_TICK_SEC, publish one "jobs_tick" event carrying progress
+    rows for all jobs that advanced, so broker traffic stays constant no
+    matter how many wipes run at once.
+    """
+    global _progress_dirty
+    while True:
+        time.sleep(PROGRESS_TICK_SEC)
+        with _progress_lock:
+            dirty, _progress_dirty = _progress_dirty, set()
+        if not dirty:
+            continue
+        rows = []
+        for jid in dirty:
+            job = jobs.get(jid)
+            if job is not None:
+                rows.append({k: job[k] for k in JOB_PROGRESS_KEYS})
+        if rows:
+            invalidate_cache(_jobs_cache)
+            events_broker.publish({"type": "jobs_tick", "rows": rows, "ts": time.time()})
+
+
+# ------------------------------------------------------------------------------
+# Audit log writer
+# ------------------------------------------------------------------------------
+
+def audit_writer_thread():
+    """
+    Single consumer of _audit_q: appends job records to the monthly JSONL file,
+    keeping the handle open and fsyncing at most every AUDIT_FSYNC_INTERVAL_SEC.
+    """
+    fh = None
+    fh_month = None
+    dirty = False
+    last_sync = time.monotonic()
+
+    while True:
+        try:
+            batch = [_audit_q.get(timeout=AUDIT_FSYNC_INTERVAL_SEC)]
+        except queue.Empty:
+            batch = []
+        # drain whatever else is queued so it goes out in one write
+        while True:
+            try:
+                batch.append(_audit_q.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            if batch:
+                month = time.strftime("%Y-%m")
+                if fh is None or month != fh_month:
+                    if fh is not None:
+                        os.fsync(fh.fileno())
+                        fh.close()
+                        fh = None
+                    AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
+                    fh = open(AUDIT_LOG_DIR / f"jobs-{month}.log", "a")
+                    fh_month = month
+                fh.write("".join(_dumps(rec) + "\n" for rec in batch))
+                fh.flush()
+                dirty = True
+
+            now = time.monotonic()
+            if dirty and (now - last_sync) >= AUDIT_FSYNC_INTERVAL_SEC:
+                os.fsync(fh.fileno())
+                dirty = False
+                last_sync = now
+        except Exception as e:
+            log.error("[audit_writer_thread] failed to write audit log: %s", e)
+            if fh is not None:
+                try:
+                    fh.close()
+                except Exception:
+                    pass
+            fh = None
+            dirty = False
+
+
 # ------------------------------------------------------------------------------
 # App bootstrap
 # ------------------------------------------------------------------------------
 
 def bootstrap_initial_state():
+    snapshot = scan_disks()
     with state_lock:
         disks.clear()
-        disks.update(scan_disks())
+        disks.update(snapshot)
+        _refresh_disks_snapshot()
 
 
-def main():
-    global events_broker
-    events_broker = EventBroker()
+_services_lock = threading.Lock()
+_services_started = False
 
-    # Initial snapshot
-    bootstrap_initial_state()
-    # Prevent immediate throttling on startup
-    for _name in list(disks.keys()):
-        last_events.pop(_name, None)
 
-    # Start udev watcher
-    t = threading.Thread(target=udev_monitor_thread, daemon=True)
-    t.start()
+def start_background_services():
+    """
+    Create the broker, take the initial disk snapshot and start the udev and
+    audit threads. Idempotent, so it is safe to call from both main() and a
+    WSGI entry point (wsgi.py) that imports this module.
+    """
+    global events_broker, UDEV_CTX, _services_started, _INDEX_HTML
+    with _services_lock:
+        if _services_started:
+            return
+        setup_logging()
+        events_broker = EventBroker()
+        UDEV_CTX = pyudev.Context()
+
+        # Initial snapshot
+        bootstrap_initial_state()
+
+        # Start udev watcher
+        start_udev_monitor()
+
+        # Start audit log writer and merged job-progress publisher
+        threading.Thread(target=audit_writer_thread, daemon=True).start()
+        threading.Thread(target=progress_publisher_thread, daemon=True).start()
+
+        # Pre-render the (static) index page
+        with app.app_context():
+            _INDEX_HTML = _render_index()
+
+        _services_started = True
+
+
+def main():
+    start_background_services()
 
-    # Run Flask (development server; use systemd + gunicorn/uwsgi for prod)
+    # Run Flask (development server; for prod use gunicorn via wsgi.py)
     app.run(host="0.0.0.0", port=8080, debug=False, threaded=True)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,16 @@
+# TCS Wipe Station - gunicorn settings
+# - gevent worker: every SSE subscriber is a greenlet on one epoll-backed hub,
+#   not an OS thread (see wsgi.py)
+# - Run with: gunicorn -c gunicorn.conf.py wsgi:app
+
+bind = "0.0.0.0:8080"
+
+# Exactly one worker: disks, jobs and the SSE broker live in process memory
+workers = 1
+worker_class = "gevent"
+
+# Upper bound on concurrent connections (mostly idle /events streams)
+worker_connections = 4096
+
+# SSE streams never finish; keep idle keep-alive sockets short-lived
+keepalive = 5
@@ -18,13 +18,18 @@ import argparse
 import io
 import os
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.colors import Color, black, HexColor
-from PyPDF2 import PdfReader, PdfWriter, PdfMerger
+# ReportLab and pdfrw are imported on first use (see _rl/_rw), so importing
+# this module or only printing doesn't pay for them
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
+    from pdfrw import PdfDict
 
 # -------------- Config --------------
 
@@ -80,75 +85,145 @@ FIELD_FONTSIZE = {
 }
 
 DEFAULT_FONT_SIZE = 11.5
-FIELD_COLOR = black
+FIELD_COLOR = "#000000"
+
+# Render-time layout as parallel columns, built once from the dicts above
+# (which stay the place to edit positions). Ordered by font size, default
+# size first, so each size is selected only once. A render gathers the data
+# into a matching values column and walks them side by side.
+_FIELD_KEYS, _FIELD_SIZES, _FIELD_XS, _FIELD_YS = zip(*sorted(
+    ((k, FIELD_FONTSIZE.get(k, DEFAULT_FONT_SIZE), x, y) for k, (x, y) in FIELDS_TOPLEFT.items()),
+    key=lambda t: (t[1] != DEFAULT_FONT_SIZE, t[1]),
+))
 
 # Debug drawing options (enabled by CLI flags)
 GRID_STEP = 36    # 0.5 inch grid (72 pt = 1in)
 CROSSHAIR_SIZE = 6
 BOUNDING_BOX_PADDING = 2
+GUIDE_COLOR = "#223056"
+RULER_COLOR = "#9fb0c8"
+CROSSHAIR_COLOR = "#2d7ef7"
+BBOX_COLOR = "#76b3fa"
 
 # -------------- Helpers --------------
 
+@lru_cache(maxsize=None)
+def _rl() -> SimpleNamespace:
+    """ReportLab modules, imported on the first render."""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import HexColor
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    return SimpleNamespace(canvas=canvas, HexColor=HexColor, pdfmetrics=pdfmetrics, TTFont=TTFont)
+
+@lru_cache(maxsize=None)
+def _rw() -> SimpleNamespace:
+    """pdfrw, imported on the first template read."""
+    import pdfrw
+    from pdfrw.buildxobj import pagexobj
+    return SimpleNamespace(PdfReader=pdfrw.PdfReader, PdfWriter=pdfrw.PdfWriter,
+                           PdfDict=pdfrw.PdfDict, PdfArray=pdfrw.PdfArray,
+                           PdfName=pdfrw.PdfName, pagexobj=pagexobj)
+
+def _makerl(c: "Canvas", obj):
+    from pdfrw.toreportlab import makerl  # needs both ReportLab and pdfrw
+    return makerl(c, obj)
+
+@lru_cache(maxsize=None)
+def _color(spec: str):
+    """ReportLab color for a "#rrggbb" config value, parsed once per value."""
+    return _rl().HexColor(spec)
+
 @dataclass
 class PageGeom:
     width: float
     height: float
 
+# pdfrw objects are annotated in place while converting to ReportLab, so
+# concurrent renders (several wipes finishing together) take turns on the
+# cached template and guides forms
+_TEMPLATE_LOCK = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _load_template(path: str, mtime: float) -> "PdfDict":
+    """First template page, cached per (path, mtime) so an edited template is re-read."""
+    return _rw().PdfReader(path).pages[0]
+
+def load_template(path: str) -> "PdfDict":
+    return _load_template(path, os.stat(path).st_mtime)
+
+def _forget_rl_doc(obj, rldoc):
+    """
+    makerl() memoizes its conversions on the pdfrw objects, keyed by the
+    ReportLab document; drop them once a render is saved so the cached
+    template doesn't keep every past canvas alive.
+    """
+    rw = _rw()
+    seen = set()
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        converted = getattr(o, "derived_rl_obj", None)
+        if converted:
+            converted.pop(rldoc, None)
+        if isinstance(o, rw.PdfDict):
+            stack.extend(v for _, v in o.iteritems())
+        elif isinstance(o, rw.PdfArray):
+            stack.extend(o)
+
 def detect_template_geometry(path: str) -> PageGeom:
     """Read the first page size from the template PDF."""
-    reader = PdfReader(path)
-    page = reader.pages[0]
-    # PyPDF2 returns a RectangleObject; use .width/.height
-    w = float(page.mediabox.width)
-    h = float(page.mediabox.height)
-    return PageGeom(width=w, height=h)
-
-def top_left_to_rl(x_tl: float, y_tl: float, geom: PageGeom,
-                   dx: float = 0, dy: float = 0) -> Tuple[float, float]:
+    with _TEMPLATE_LOCK:
+        # MediaBox is [llx lly urx ury], possibly inherited from the page tree
+        x0, y0, x1, y1 = (float(v) for v in load_template(path).inheritable.MediaBox)
+    return PageGeom(width=x1 - x0, height=y1 - y0)
+
+@lru_cache(maxsize=None)
+def _font_name() -> str:
     """
-    Convert top-left origin to ReportLab's bottom-left origin.
-    Apply global dx/dy nudges after conversion (dx to the right, dy downward).
+    Register DejaVuSans if available; else fall back to Helvetica.
+    Resolved once per process: the TTF is parsed a single time, not per render.
     """
-    x = x_tl + dx
-    y = geom.height - y_tl + dy
-    return x, y
-
-def pick_font(c: canvas.Canvas) -> str:
-    """Try to register and use DejaVuSans if available; else Helvetica."""
     for p in TRY_FONT_PATHS:
         if os.path.exists(p):
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
+            rl = _rl()
             try:
-                pdfmetrics.registerFont(TTFont("DejaVuSans", p))
-                c.setFont("DejaVuSans", DEFAULT_FONT_SIZE)
+                rl.pdfmetrics.registerFont(rl.TTFont("DejaVuSans", p))
                 return "DejaVuSans"
             except Exception:
                 pass
-    c.setFont(FALLBACK_FONT, DEFAULT_FONT_SIZE)
     return FALLBACK_FONT
 
-def draw_guides(c: canvas.Canvas, geom: PageGeom, grid: bool, rulers: bool):
+def pick_font(c: "Canvas") -> str:
+    """Select the field font on the canvas and return its name."""
+    font_name = _font_name()
+    c.setFont(font_name, DEFAULT_FONT_SIZE)
+    return font_name
+
+def draw_guides(c: "Canvas", geom: PageGeom, grid: bool, rulers: bool):
     """Optional debug rulers and grid lines."""
     c.saveState()
-    c.setStrokeColor(HexColor("#223056"))
+    c.setStrokeColor(_color(GUIDE_COLOR))
     c.setLineWidth(0.3)
 
     if grid:
-        # vertical
-        x = 0
-        while x <= geom.width:
-            c.line(x, 0, x, geom.height)
-            x += GRID_STEP
-        # horizontal
-        y = 0
-        while y <= geom.height:
-            c.line(0, y, geom.width, y)
-            y += GRID_STEP
+        # one path for the whole grid: a single stroke instead of a
+        # stroked line per grid line
+        p = c.beginPath()
+        for x in range(0, int(geom.width) + 1, GRID_STEP):    # vertical
+            p.moveTo(x, 0)
+            p.lineTo(x, geom.height)
+        for y in range(0, int(geom.height) + 1, GRID_STEP):   # horizontal
+            p.moveTo(0, y)
+            p.lineTo(geom.width, y)
+        c.drawPath(p, stroke=1, fill=0)
 
     if rulers:
         # Top ruler (0 at left)
-        c.setFillColor(HexColor("#9fb0c8"))
+        c.setFillColor(_color(RULER_COLOR))
         for x in range(0, int(geom.width), 72):  # inches in points
             c.drawString(x + 2, geom.height - 12, f"{x//72}\"")
         # Left ruler (0 at top)
@@ -156,20 +231,41 @@ def draw_guides(c: canvas.Canvas, geom: PageGeom, grid: bool, rulers: bool):
             c.drawString(2, geom.height - y - 12, f"{i}\"")
     c.restoreState()
 
-def draw_crosshair(c: canvas.Canvas, x: float, y: float, size: float = CROSSHAIR_SIZE, color="#2d7ef7"):
+@lru_cache(maxsize=8)
+def _guides_form(width: float, height: float, grid: bool, rulers: bool) -> "PdfDict":
+    """
+    Guides depend only on page size and flags: render them once into their
+    own page and reuse it as a form XObject on every debug render.
+    """
+    buf = io.BytesIO()
+    c = _rl().canvas.Canvas(buf, pagesize=(width, height))
+    pick_font(c)
+    draw_guides(c, PageGeom(width=width, height=height), grid=grid, rulers=rulers)
+    c.showPage()
+    c.save()
+    rw = _rw()
+    return rw.pagexobj(rw.PdfReader(fdata=buf.getvalue()).pages[0])
+
+def draw_crosshair(c: "Canvas", x: float, y: float, size: float = CROSSHAIR_SIZE,
+                   color: str = CROSSHAIR_COLOR):
     c.saveState()
-    c.setStrokeColor(HexColor(color))
+    c.setStrokeColor(_color(color))
     c.setLineWidth(0.8)
     c.line(x - size, y, x + size, y)
     c.line(x, y - size, x, y + size)
     c.restoreState()
 
-def draw_bounding_box(c: canvas.Canvas, x: float, y: float, text: str, font_name: str, font_size: float):
-    """Very rough bounding rect (width is approximate using 0.55*fontsize per char)."""
+@lru_cache(maxsize=4096)
+def _string_width(text: str, font_name: str, font_size: float) -> float:
+    """Advance width from the font metrics; field values repeat a lot across certs."""
+    return _rl().pdfmetrics.stringWidth(text, font_name, font_size)
+
+def draw_bounding_box(c: "Canvas", x: float, y: float, text: str, font_name: str, font_size: float):
+    """Bounding rect: real string width from the font metrics, height = font size."""
     c.saveState()
-    c.setStrokeColor(HexColor("#76b3fa"))
+    c.setStrokeColor(_color(BBOX_COLOR))
     c.setLineWidth(0.5)
-    est_w = len(text) * font_size * 0.55
+    est_w = _string_width(text, font_name, font_size)
     est_h = font_size
     c.rect(x - BOUNDING_BOX_PADDING,
            y - BOUNDING_BOX_PADDING,
@@ -180,66 +276,232 @@ def draw_bounding_box(c: canvas.Canvas, x: float, y: float, text: str, font_name
 
 # -------------- Core overlay renderer --------------
 
-def render_overlay(geom: PageGeom, template_path: str, out_path: str, data: Dict[str, str],
-                   dx: float = 0, dy: float = 0, debug: bool = False,
-                   grid: bool = False, crosshair: bool = False, rulers: bool = False):
-    """
-    Create an overlay PDF (in-memory) and merge onto the template.
-    """
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=(geom.width, geom.height))
+@lru_cache(maxsize=None)
+def _core_font() -> "PdfDict":
+    """Core font resource for the hand-written fast path (no embedding needed)."""
+    rw = _rw()
+    return rw.PdfDict(Type=rw.PdfName.Font, Subtype=rw.PdfName.Type1,
+                      BaseFont=rw.PdfName(FALLBACK_FONT), Encoding=rw.PdfName.WinAnsiEncoding)
 
-    font_name = pick_font(c)
+# Escapes for a PDF literal string "(...)", applied in one str.translate pass
+_PDF_STRING_ESCAPES = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
 
-    # Guides first (so text sits on top)
-    if debug:
-        draw_guides(c, geom, grid=grid, rulers=rulers)
+@lru_cache(maxsize=1024)
+def _field_op(value: str, x: float, y: float) -> Optional[str]:
+    """
+    Tm/Tj operators placing one value, or None if it can't be shown in
+    WinAnsi. Cached per (value, position): near-constant fields (OPERATOR,
+    METHOD, LEVEL, RESULT ...) hit across certificates even though CERT_ID
+    and the timestamps never repeat.
+    """
+    try:
+        raw = value.encode("cp1252").decode("latin-1")  # pdfrw streams are latin-1 str
+    except UnicodeEncodeError:
+        return None
+    return f"1 0 0 1 {x:.2f} {y:.2f} Tm ({raw.translate(_PDF_STRING_ESCAPES)}) Tj"
 
-    # Draw fields
-    for key, (x_tl, y_tl) in FIELDS_TOPLEFT.items():
-        value = data.get(key, "")
+def _field_ops(values: Tuple[str, ...], height: float, dx: float, dy: float) -> Optional[str]:
+    """
+    Content stream drawing the fields in the core font, one text object.
+    None if a value can't be shown in WinAnsi (the caller then uses ReportLab).
+    """
+    oy = height + dy
+    # "#rrggbb" -> 0..1 components, without pulling in ReportLab
+    r, g, b = (int(FIELD_COLOR[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    ops = [f"BT {r:g} {g:g} {b:g} rg"]
+    cur_size = None
+    for value, size, x_tl, y_tl in zip(values, _FIELD_SIZES, _FIELD_XS, _FIELD_YS):
         if not value:
             continue
-        x, y = top_left_to_rl(x_tl, y_tl, geom, dx=dx, dy=dy)
-        size = FIELD_FONTSIZE.get(key, DEFAULT_FONT_SIZE)
-        c.setFont(font_name, size)
-        c.setFillColor(FIELD_COLOR)
-        c.drawString(x, y, value)
-
-        if debug:
-            if crosshair:
-                draw_crosshair(c, x, y)
-            draw_bounding_box(c, x, y, value, font_name, size)
-
+        op = _field_op(value, x_tl + dx, oy - y_tl)
+        if op is None:
+            return None
+        if size != cur_size:
+            ops.append(f"/F1 {size:g} Tf")
+            cur_size = size
+        ops.append(op)
+    ops.append("ET")
+    return "\n".join(ops)
+
+def _render_direct(geom: PageGeom, template_path: str, out, values: Tuple[str, ...],
+                   dx: float, dy: float) -> bool:
+    """
+    Production fast path: write the output page by hand (template form + a
+    few text operators) without going through a ReportLab canvas.
+    Returns False if the data needs the ReportLab path.
+    """
+    ops = _field_ops(values, geom.height, dx, dy)
+    if ops is None:
+        return False
+    rw = _rw()
+    with _TEMPLATE_LOCK:
+        page = rw.PdfDict(
+            Type=rw.PdfName.Page,
+            MediaBox=rw.PdfArray([0, 0, geom.width, geom.height]),
+            Resources=rw.PdfDict(
+                XObject=rw.PdfDict(Tpl=rw.pagexobj(load_template(template_path))),
+                Font=rw.PdfDict(F1=_core_font()),
+            ),
+            Contents=rw.PdfDict(stream="q /Tpl Do Q\n" + ops),
+        )
+        writer = rw.PdfWriter()
+        writer.addpage(page)
+        writer.write(out)
+    return True
+
+def _begin_canvas(geom: PageGeom, template_path: str, out,
+                  grid: bool = False, rulers: bool = False):
+    """Output canvas with the template (and cached guides, if asked) already placed."""
+    c = _rl().canvas.Canvas(out, pagesize=(geom.width, geom.height))
+    with _TEMPLATE_LOCK:
+        forms = [_rw().pagexobj(load_template(template_path))]
+        # Guides first (so text sits on top)
+        if grid or rulers:
+            forms.append(_guides_form(geom.width, geom.height, grid, rulers))
+        for form in forms:
+            c.doForm(_makerl(c, form))
+    return c, forms
+
+def _finish_canvas(c: "Canvas", forms):
     c.showPage()
     c.save()
-    buf.seek(0)
+    with _TEMPLATE_LOCK:
+        for form in forms:
+            _forget_rl_doc(form, c._doc)
+
+def _render_overlay_prod(geom: PageGeom, template_path: str, out,
+                         values: Tuple[str, ...], dx: float, dy: float):
+    """Production render: no debug aids, so the field loop carries no debug branches."""
+    if _font_name() == FALLBACK_FONT:
+        if _render_direct(geom, template_path, out, values, dx, dy):
+            return
+
+    c, forms = _begin_canvas(geom, template_path, out)
+    font_name = pick_font(c)
 
-    # Merge overlay onto template
-    base = PdfReader(template_path)
-    over = PdfReader(buf)
-    out = PdfWriter()
+    # Top-left origin -> ReportLab's bottom-left origin, with the global
+    # dx/dy nudges folded into one offset per axis: x = x_tl + dx,
+    # y = height - y_tl + dy
+    oy = geom.height + dy
+
+    # Draw fields, all in one text object (a single BT ... ET)
+    t = c.beginText()
+    t.setFont(font_name, DEFAULT_FONT_SIZE)
+    t.setFillColor(_color(FIELD_COLOR))
+    cur_size = DEFAULT_FONT_SIZE
+    for value, size, x_tl, y_tl in zip(values, _FIELD_SIZES, _FIELD_XS, _FIELD_YS):
+        if not value:
+            continue
+        if size != cur_size:
+            t.setFont(font_name, size)
+            cur_size = size
+        t.setTextOrigin(x_tl + dx, oy - y_tl)
+        t.textOut(value)
+    c.drawText(t)
+
+    _finish_canvas(c, forms)
+
+def _render_overlay_debug(geom: PageGeom, template_path: str, out,
+                          values: Tuple[str, ...], dx: float, dy: float,
+                          grid: bool, crosshair: bool, rulers: bool):
+    """Debug render: same layout plus guides, bounding boxes and crosshairs."""
+    c, forms = _begin_canvas(geom, template_path, out, grid=grid, rulers=rulers)
+    font_name = pick_font(c)
 
-    page = base.pages[0]
-    page.merge_page(over.pages[0])
-    out.add_page(page)
+    oy = geom.height + dy
+    t = c.beginText()
+    t.setFont(font_name, DEFAULT_FONT_SIZE)
+    t.setFillColor(_color(FIELD_COLOR))
+    cur_size = DEFAULT_FONT_SIZE
+    marks = []  # graphics can't go inside the text object; drawn after it
+    for value, size, x_tl, y_tl in zip(values, _FIELD_SIZES, _FIELD_XS, _FIELD_YS):
+        if not value:
+            continue
+        x, y = x_tl + dx, oy - y_tl
+        if size != cur_size:
+            t.setFont(font_name, size)
+            cur_size = size
+        t.setTextOrigin(x, y)
+        t.textOut(value)
+        marks.append((x, y, value, size))
+    c.drawText(t)
+
+    for x, y, value, size in marks:
+        if crosshair:
+            draw_crosshair(c, x, y)
+        draw_bounding_box(c, x, y, value, font_name, size)
+
+    _finish_canvas(c, forms)
+
+def _write_atomic(path: str, data: bytes):
+    """
+    Write in one go to a temp file next to path, then rename over it: lp or
+    a share client never sees a half-written certificate.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # unique per writer
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)  # umask applies, as with open()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
-    with open(out_path, "wb") as f:
-        out.write(f)
+def render_overlay(geom: PageGeom, template_path: str, out_path: str, data: Dict[str, str],
+                   dx: float = 0, dy: float = 0, debug: bool = False,
+                   grid: bool = False, crosshair: bool = False, rulers: bool = False):
+    """
+    Stamp the fields straight onto the template: the template page is drawn
+    as a form XObject on the output canvas, so there is no separate overlay
+    PDF to parse and merge.
+    Without debug aids and with the core font, the page is written by hand
+    (_render_direct) and ReportLab is skipped altogether. The debug flags
+    are checked once per render, not per field.
+    """
+    values = tuple(data.get(k, "") for k in _FIELD_KEYS)  # only what's drawn
+    buf = io.BytesIO()
+    if debug:
+        _render_overlay_debug(geom, template_path, buf, values, dx, dy,
+                              grid=grid, crosshair=crosshair, rulers=rulers)
+    else:
+        _render_overlay_prod(geom, template_path, buf, values, dx, dy)
+    _write_atomic(out_path, buf.getvalue())
+
+def _render_one(args) -> str:
+    geom, template_path, out_path, data, opts = args
+    render_overlay(geom=geom, template_path=template_path, out_path=out_path, data=data, **opts)
+    return out_path
+
+def render_many(jobs: List[Tuple[str, Dict[str, str]]], template_path: str,
+                max_workers: Optional[int] = None, **opts) -> List[str]:
+    """
+    Render a batch of certificates in parallel, one process per core.
+    jobs is a list of (out_path, data) pairs; opts are passed through to
+    render_overlay (dx, dy, debug, ...). Each worker parses and caches the
+    template on its first render. Returns the output paths in job order.
+    """
+    geom = detect_template_geometry(template_path)
+    work = [(geom, template_path, out_path, data, opts) for out_path, data in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        return list(ex.map(_render_one, work))
 
 # -------------- Printing --------------
 
-def send_to_printer(pdf_path: str, printer: str = None):
+def send_to_printer(pdf_paths: Union[str, List[str]], printer: str = None):
     """
-    Call CUPS lp to print the file.
+    Call CUPS lp to print one file or a batch (a single lp run for the whole
+    batch, so the fork/exec is paid once).
     If printer is None, rely on system default.
     """
-    cmd = ["lp", pdf_path]
-    if printer:
-        cmd = ["lp", "-d", printer, pdf_path]
+    if isinstance(pdf_paths, str):
+        pdf_paths = [pdf_paths]
+    if not pdf_paths:
+        return
+    cmd = ["lp"] + (["-d", printer] if printer else []) + list(pdf_paths)
     try:
         subprocess.check_call(cmd)
-        print(f"[print] sent to printer: {printer or '(default)'}")
+        print(f"[print] sent {len(pdf_paths)} file(s) to printer: {printer or '(default)'}")
     except FileNotFoundError:
         print("[print] 'lp' not found. Is CUPS installed?")
     except subprocess.CalledProcessError as e:
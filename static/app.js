@@ -13,6 +13,18 @@ const jfPrintEl   = document.getElementById("jf-print");
 // Track running jobs by disk to disable buttons & avoid multi-start
 const runningByDisk = new Map();
 
+// Last known full job state by id (progress ticks only carry a delta)
+const jobsById = new Map();
+
+function mergeJob(job, delta) {
+  const prev = jobsById.get(job.id);
+  // a late progress row must not override a job that already finished
+  if (delta && prev && prev.status !== "running") return prev;
+  const merged = delta ? { ...(prev || {}), ...job } : job;
+  jobsById.set(merged.id, merged);
+  return merged;
+}
+
 function bytesToGB(n) {
   if (n == null || isNaN(n)) return "";
   return (n / 1e9).toFixed(1) + " GB";
@@ -115,17 +127,23 @@ document.addEventListener("click", async (e) => {
 });
 
 
+// The server coalesces bursts into {type: "batch", events: [...]}
+function unwrapEvents(evt) {
+  return evt.type === "batch" ? evt.events : [evt];
+}
+
 function initJobSSE() {
   const es = new EventSource("/events/jobs");
-  es.onmessage = (msg) => {
-    const evt = JSON.parse(msg.data);
+  es.onmessage = (msg) => unwrapEvents(JSON.parse(msg.data)).forEach(evt => {
     if (evt.type === "jobs_snapshot") {
-      evt.jobs.forEach(updateJobUI);
+      evt.jobs.forEach(job => updateJobUI(mergeJob(job, false)));
     } else if (evt.type === "job") {
-      updateJobUI(evt.job);
+      updateJobUI(mergeJob(evt.job, false));
+    } else if (evt.type === "jobs_tick") {
+      evt.rows.forEach(row => updateJobUI(mergeJob(row, true)));
     }
-  };
-  es.onerror = () => setTimeout(initJobSSE, 1500);
+  });
+  es.onerror = () => { es.close(); setTimeout(initJobSSE, 1500); };
 }
 
 function renderMeta(job) {
@@ -247,8 +265,7 @@ async function refreshOnce() {
 
 function initDiskSSE() {
   const es = new EventSource("/events");
-  es.onmessage = (msg) => {
-    const evt = JSON.parse(msg.data);
+  es.onmessage = (msg) => unwrapEvents(JSON.parse(msg.data)).forEach(evt => {
     logEvent(evt);
     if (evt.type === "snapshot") {
       renderSnapshot(evt.disks, []);
@@ -257,8 +274,8 @@ function initDiskSSE() {
     } else if (evt.type === "remove") {
       removeRow(evt.disk);
     }
-  };
-  es.onerror = () => setTimeout(initDiskSSE, 1500);
+  });
+  es.onerror = () => { es.close(); setTimeout(initDiskSSE, 1500); };
 }
 
 window.addEventListener("DOMContentLoaded", async () => {
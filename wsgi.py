@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# TCS Wipe Station - WSGI entry point
+# - Production server for many long-lived SSE clients (one coroutine each):
+#     gunicorn -c gunicorn.conf.py wsgi:app
+# - Settings (gevent worker, single process, connection limit) live in gunicorn.conf.py.
+# - The gevent worker monkey-patches threading/queue/subprocess, so the udev
+#   watcher, wipe workers and EventBroker queues cooperate with the event loop.
+
+from app import app, start_background_services
+
+start_background_services()